@@ -3,10 +3,20 @@
 
 let vocabularyData = null;
 let fragmentAliasMap = null;
+let concepts = null; // Maps URI to concept; children are referenced by URI
 
-        let allConcepts = [];
-        let uniqueConceptUris = new Set();
+        let viewerStats = null;
         let conceptMap = new Map(); // Maps URI to concept object with all paths
+        let searchEntries = []; // Lowercased label/altLabel/notation plus the conceptMap entry, in conceptMap order
+        let pendingChildren = new Map(); // Maps encoded path key to the path of a concept whose children are not rendered yet
+        let conceptElements = new Map(); // Maps encoded path key to its rendered .concept element
+        let conceptParts = new WeakMap(); // Caches the header, icon and sections of a rendered .concept element
+        let searchGeneration = 0; // Incremented per search so stale result batches stop rendering
+
+        const SEARCH_RESULTS_BATCH_SIZE = 50;
+        const requestIdle = window.requestIdleCallback
+            ? callback => window.requestIdleCallback(callback)
+            : callback => setTimeout(() => callback({ timeRemaining: () => 0 }), 1);
 
         function pathKey(path) {
             return path.map(c => c.uri).join('>');
@@ -16,64 +26,33 @@ let fragmentAliasMap = null;
             return encodeURIComponent(pathKey(path));
         }
 
-        function buildConceptMap(concepts, path = []) {
-            concepts.forEach(concept => {
-                const currentPath = [...path, concept];
-                const currentKey = pathKey(currentPath);
-
-                // Store concept with all possible paths
-                if (!conceptMap.has(concept.uri)) {
-                    conceptMap.set(concept.uri, {
-                        concept: concept,
-                        paths: [currentPath],
-                        pathKeys: new Set([currentKey])
-                    });
-                } else {
-                    const data = conceptMap.get(concept.uri);
-                    if (!data.pathKeys.has(currentKey)) {
-                        data.paths.push(currentPath);
-                        data.pathKeys.add(currentKey);
-                    }
-                }
-
-                uniqueConceptUris.add(concept.uri);
-                allConcepts.push(concept);
-
-                if (concept.narrower && concept.narrower.length > 0) {
-                    buildConceptMap(concept.narrower, currentPath);
-                }
-
-                if (concept.procedures && concept.procedures.length > 0) {
-                    buildConceptMap(concept.procedures, currentPath);
-                }
-            });
-        }
-
-        function countConcepts(concepts) {
-            concepts.forEach(concept => {
-                uniqueConceptUris.add(concept.uri);
-                allConcepts.push(concept);
-                if (concept.narrower && concept.narrower.length > 0) {
-                    countConcepts(concept.narrower);
-                }
-                if (concept.procedures && concept.procedures.length > 0) {
-                    countConcepts(concept.procedures);
-                }
+        // The search index is precomputed in Python: one entry per concept with its
+        // unescaped label/altLabel/notation, each path given as the index
+        // positions of the concept's ancestors.
+        function buildConceptMap(searchIndex) {
+            Object.keys(concepts).forEach(uri => {
+                concepts[uri].uri = uri;
             });
-            return uniqueConceptUris.size;
-        }
-
-        function getMaxDepth(concepts, depth = 1) {
-            let maxDepth = depth;
-            concepts.forEach(concept => {
-                if (concept.narrower && concept.narrower.length > 0) {
-                    maxDepth = Math.max(maxDepth, getMaxDepth(concept.narrower, depth + 1));
-                }
-                if (concept.procedures && concept.procedures.length > 0) {
-                    maxDepth = Math.max(maxDepth, getMaxDepth(concept.procedures, depth + 1));
-                }
+            const indexed = searchIndex.map(entry => concepts[entry.uri]);
+            searchIndex.forEach((entry, position) => {
+                const concept = indexed[position];
+                const data = {
+                    uri: entry.uri,
+                    concept: concept,
+                    paths: entry.paths.map(ancestors => [...ancestors.map(i => indexed[i]), concept])
+                };
+                conceptMap.set(entry.uri, data);
+                const label = entry.label.toLowerCase();
+                const altLabel = entry.altLabel ? entry.altLabel.toLowerCase() : '';
+                const notation = entry.notation ? entry.notation.toLowerCase() : '';
+                searchEntries.push({
+                    label: label,
+                    altLabel: altLabel,
+                    notation: notation,
+                    maxLength: Math.max(label.length, altLabel.length, notation.length),
+                    data: data
+                });
             });
-            return maxDepth;
         }
 
         function copyToClipboard(text) {
@@ -126,14 +105,15 @@ let fragmentAliasMap = null;
             }
         }
 
-        function renderConcept(concept, level = 0, path = []) {
+        // Appends the concept's markup to parts; the caller joins once at the end.
+        // Children are left as empty containers until renderChildren is called.
+        function renderConcept(concept, parts, level = 0, path = []) {
             const currentPath = [...path, concept];
             const currentPathKey = pathKeyEncoded(currentPath);
             const hasNarrower = concept.narrower && concept.narrower.length > 0;
             const hasProcedures = concept.procedures && concept.procedures.length > 0;
             const hasChildren = hasNarrower || hasProcedures;
-            const hasDefinition = (concept.definitions && concept.definitions.length > 0) ||
-                (concept.definition !== null && concept.definition !== undefined && concept.definition !== '');
+            const hasDefinition = concept.definitions && concept.definitions.length > 0;
             const hasExactMatch = concept.exactMatch && concept.exactMatch.length > 0;
             const hasCloseMatch = concept.closeMatch && concept.closeMatch.length > 0;
 
@@ -149,16 +129,16 @@ let fragmentAliasMap = null;
             const procedureClass = concept.isProcedure ? 'procedure' : '';
             const toggleIcon = hasChildren ? '▶' : '●';
 
-            let html = `
-                <div class="concept" data-uri="${concept.uri}" data-path-key="${currentPathKey}">
+            parts.push(`
+                <div class="concept" data-uri="${concept.uriHtml}" data-path-key="${currentPathKey}">
                     <div class="concept-header ${noChildClass} ${procedureClass}" onclick="toggleConcept(this)">
                         <span class="toggle-icon">${toggleIcon}</span>
                         ${notation}
                         <span class="concept-label">${concept.label}${procedureBadge}${altLabelHtml}</span>
-                        <button class="copy-uri-btn" onclick="event.stopPropagation(); copyToClipboard('${concept.uri}')">📋 Copy URI</button>
+                        <button class="copy-uri-btn" onclick="event.stopPropagation(); copyToClipboard(this.closest('.concept').dataset.uri)">📋 Copy URI</button>
                         ${count}
                     </div>
-            `;
+            `);
 
             if (concept.definitions && concept.definitions.length > 0) {
                 const defItems = concept.definitions.map(d => {
@@ -167,55 +147,98 @@ let fragmentAliasMap = null;
                         : '';
                     return `<div class="definition-item">${d.text}${sourceHtml}</div>`;
                 }).join('');
-                html += `<div class="concept-definition">${defItems}</div>`;
-            } else if (concept.definition) {
-                html += `<div class="concept-definition">${concept.definition}</div>`;
+                parts.push(`<div class="concept-definition">${defItems}</div>`);
             }
 
             if (concept.exactMatch && concept.exactMatch.length > 0) {
                 const exactMatchLinks = concept.exactMatch.map(m =>
                     `<a href="${m.uri}" target="_blank" class="exact-match-link">${m.label}</a>`
                 ).join(', ');
-                html += `<div class="exact-match-info">See also: ${exactMatchLinks}</div>`;
+                parts.push(`<div class="exact-match-info">See also: ${exactMatchLinks}</div>`);
             }
 
             if (concept.closeMatch && concept.closeMatch.length > 0) {
                 const closeMatchLinks = concept.closeMatch.map(m =>
                     `<a href="${m.uri}" target="_blank" class="close-match-link">${m.label}</a>`
                 ).join(', ');
-                html += `<div class="close-match-info">Related terms: ${closeMatchLinks}</div>`;
+                parts.push(`<div class="close-match-info">Related terms: ${closeMatchLinks}</div>`);
             }
 
             if (hasProcedures) {
-                html += `<div class="procedures-section">
+                parts.push(`<div class="procedures-section">
                     <div class="procedures-title">📋 Procedures:</div>
-                    <div class="concept-children">`;
-                concept.procedures.forEach(proc => {
-                    html += renderConcept(proc, level + 1, currentPath);
-                });
-                html += `</div></div>`;
+                    <div class="concept-children"></div></div>`);
             }
 
             if (hasNarrower) {
-                html += `<div class="concept-children">`;
-                concept.narrower.forEach(narrower => {
-                    html += renderConcept(narrower, level + 1, currentPath);
+                parts.push(`<div class="concept-children"></div>`);
+            }
+
+            if (hasChildren) {
+                pendingChildren.set(currentPathKey, currentPath);
+            }
+
+            parts.push(`</div>`);
+        }
+
+        // Registers the .concept elements just rendered into container
+        function registerConceptElements(container) {
+            container.querySelectorAll('.concept').forEach(element => {
+                conceptElements.set(element.getAttribute('data-path-key'), element);
+            });
+        }
+
+        function getConceptParts(conceptElement) {
+            let elementParts = conceptParts.get(conceptElement);
+            if (!elementParts) {
+                const header = conceptElement.querySelector(':scope > .concept-header');
+                const procedures = conceptElement.querySelector(':scope > .procedures-section');
+                elementParts = {
+                    header: header,
+                    icon: header.querySelector('.toggle-icon'),
+                    children: conceptElement.querySelectorAll(':scope > .concept-children'),
+                    definition: conceptElement.querySelector(':scope > .concept-definition'),
+                    exactMatch: conceptElement.querySelector(':scope > .exact-match-info'),
+                    closeMatch: conceptElement.querySelector(':scope > .close-match-info'),
+                    procedures: procedures,
+                    procChildren: procedures ? procedures.querySelector('.concept-children') : null
+                };
+                conceptParts.set(conceptElement, elementParts);
+            }
+            return elementParts;
+        }
+
+        function renderChildren(conceptElement) {
+            const pathKeyValue = conceptElement.getAttribute('data-path-key');
+            const path = pendingChildren.get(pathKeyValue);
+            if (!path) return;
+            pendingChildren.delete(pathKeyValue);
+
+            const concept = path[path.length - 1];
+            const { procChildren, children } = getConceptParts(conceptElement);
+            if (procChildren) {
+                const parts = [];
+                concept.procedures.forEach(procUri => {
+                    renderConcept(concepts[procUri], parts, path.length, path);
                 });
-                html += `</div>`;
+                procChildren.innerHTML = parts.join('');
+                registerConceptElements(procChildren);
             }
 
-            html += `</div>`;
-            return html;
+            if (children.length > 0) {
+                const parts = [];
+                concept.narrower.forEach(narrowerUri => {
+                    renderConcept(concepts[narrowerUri], parts, path.length, path);
+                });
+                children[0].innerHTML = parts.join('');
+                registerConceptElements(children[0]);
+            }
         }
 
         function toggleConcept(header) {
             const concept = header.parentElement;
-            const children = concept.querySelectorAll(':scope > .concept-children');
-            const definition = concept.querySelector(':scope > .concept-definition');
-            const exactMatch = concept.querySelector(':scope > .exact-match-info');
-            const closeMatch = concept.querySelector(':scope > .close-match-info');
-            const procedures = concept.querySelector(':scope > .procedures-section');
-            const icon = header.querySelector('.toggle-icon');
+            renderChildren(concept);
+            const { children, definition, exactMatch, closeMatch, procedures, procChildren, icon } = getConceptParts(concept);
 
             // Check if there's anything to show
             const hasChildren = children.length > 0;
@@ -254,7 +277,6 @@ let fragmentAliasMap = null;
 
             if (procedures) {
                 procedures.classList.toggle('show');
-                const procChildren = procedures.querySelector('.concept-children');
                 if (procChildren && isExpanding) {
                     procChildren.classList.add('expanded');
                 }
@@ -263,20 +285,21 @@ let fragmentAliasMap = null;
 
         function renderMindmap() {
             const mindmapDiv = document.getElementById('mindmap');
-            let html = '<div class="top-level">';
+            const parts = ['<div class="top-level">'];
 
-            vocabularyData.top_concepts.forEach(concept => {
-                html += renderConcept(concept, 0);
+            vocabularyData.top_uris.forEach(uri => {
+                renderConcept(concepts[uri], parts, 0);
             });
 
-            html += '</div>';
-            mindmapDiv.innerHTML = html;
+            parts.push('</div>');
+            mindmapDiv.innerHTML = parts.join('');
+            registerConceptElements(mindmapDiv);
         }
 
         function renderStats() {
-            const totalConcepts = countConcepts(vocabularyData.top_concepts);
-            const maxDepth = getMaxDepth(vocabularyData.top_concepts);
-            const topConceptsCount = vocabularyData.top_concepts.length;
+            const totalConcepts = viewerStats.total_concepts;
+            const maxDepth = viewerStats.max_depth;
+            const topConceptsCount = viewerStats.top_concepts;
 
             const statsDiv = document.getElementById('stats');
             statsDiv.innerHTML = `
@@ -295,9 +318,68 @@ let fragmentAliasMap = null;
             `;
         }
 
+        // Search results are cloned from these templates; concept text is
+        // already HTML-escaped by the generator, so it is assigned as markup
+        const searchResultTemplate = document.createElement('div');
+        searchResultTemplate.className = 'search-result-item';
+        searchResultTemplate.innerHTML = '<div class="search-result-label"></div><div class="search-result-paths"></div>';
+        const searchPathTemplate = document.createElement('div');
+        searchPathTemplate.className = 'search-result-path-item';
+
+        function buildSearchResultNode(match) {
+            const item = searchResultTemplate.cloneNode(true);
+            item.dataset.uri = match.uri;
+
+            const notation = match.concept.notation ? `<span class="search-result-notation">${match.concept.notation}</span>` : '';
+            item.querySelector('.search-result-label').innerHTML = notation + match.concept.label;
+
+            const pathsDiv = item.querySelector('.search-result-paths');
+            match.paths.forEach((path, index) => {
+                const pathItem = searchPathTemplate.cloneNode(false);
+                pathItem.dataset.uri = match.uri;
+                pathItem.dataset.pathIndex = index;
+                pathItem.innerHTML = path.map(c => c.notation ? `${c.notation} ${c.label}` : c.label).join(' → ');
+                pathsDiv.appendChild(pathItem);
+            });
+            return item;
+        }
+
+        function buildClearSearchNode() {
+            const clearDiv = document.createElement('div');
+            clearDiv.className = 'clear-search';
+            clearDiv.textContent = 'Clear Search';
+            return clearDiv;
+        }
+
+        // Appends results in batches during idle time so typing stays responsive;
+        // a newer search bumps searchGeneration and stops the older one
+        function renderSearchResults(searchResultsDiv, matches, generation) {
+            let index = 0;
+            const renderBatch = deadline => {
+                if (generation !== searchGeneration) return;
+                const fragment = document.createDocumentFragment();
+                do {
+                    const batchEnd = Math.min(index + SEARCH_RESULTS_BATCH_SIZE, matches.length);
+                    for (; index < batchEnd; index++) {
+                        fragment.appendChild(buildSearchResultNode(matches[index]));
+                    }
+                } while (index < matches.length && deadline.timeRemaining() > 1);
+
+                if (index >= matches.length) {
+                    fragment.appendChild(buildClearSearchNode());
+                }
+                searchResultsDiv.appendChild(fragment);
+                if (index < matches.length) {
+                    requestIdle(renderBatch);
+                }
+            };
+            requestIdle(renderBatch);
+        }
+
         function searchConcepts() {
             const searchTerm = document.getElementById('searchInput').value.toLowerCase().trim();
             const searchResultsDiv = document.getElementById('searchResults');
+            const generation = ++searchGeneration;
 
             if (searchTerm === '') {
                 searchResultsDiv.classList.remove('show');
@@ -308,45 +390,23 @@ let fragmentAliasMap = null;
 
             // Search in all concepts
             const matches = [];
-            conceptMap.forEach((data, uri) => {
-                const concept = data.concept;
-                const label = concept.label.toLowerCase();
-                const altLabel = concept.altLabel ? concept.altLabel.toLowerCase() : '';
-                const notation = concept.notation ? concept.notation.toLowerCase() : '';
-
-                if (label.includes(searchTerm) || altLabel.includes(searchTerm) || notation.includes(searchTerm)) {
-                    matches.push({
-                        uri: uri,
-                        concept: concept,
-                        paths: data.paths
-                    });
+            for (let i = 0; i < searchEntries.length; i++) {
+                const entry = searchEntries[i];
+                // A term longer than every field cannot match; otherwise test the
+                // short notation first and the often-empty altLabel last
+                if (searchTerm.length > entry.maxLength) continue;
+                if ((entry.notation && entry.notation.includes(searchTerm)) ||
+                    entry.label.includes(searchTerm) ||
+                    (entry.altLabel && entry.altLabel.includes(searchTerm))) {
+                    matches.push(entry.data);
                 }
-            });
+            }
 
             // Display results
             if (matches.length > 0) {
-                let html = `<div class="search-info">Found ${matches.length} matching concept(s). Click a path to navigate.</div>`;
-
-                matches.forEach(match => {
-                    const notation = match.concept.notation ? `<span class="search-result-notation">${match.concept.notation}</span>` : '';
-                    const pathItems = match.paths.map((path, index) => {
-                        const pathLabels = path.map(c => c.notation ? `${c.notation} ${c.label}` : c.label).join(' → ');
-                        return `<div class="search-result-path-item" data-uri="${match.uri}" data-path-index="${index}">${pathLabels}</div>`;
-                    }).join('');
-
-                    html += `
-                        <div class="search-result-item" data-uri="${match.uri}">
-                            <div class="search-result-label">
-                                ${notation}${match.concept.label}
-                            </div>
-                            <div class="search-result-paths">${pathItems}</div>
-                        </div>
-                    `;
-                });
-
-                html += `<div class="clear-search" onclick="clearSearch()">Clear Search</div>`;
-                searchResultsDiv.innerHTML = html;
+                searchResultsDiv.innerHTML = `<div class="search-info">Found ${matches.length} matching concept(s). Click a path to navigate.</div>`;
                 searchResultsDiv.classList.add('show');
+                renderSearchResults(searchResultsDiv, matches, generation);
             } else {
                 // Build DOM nodes safely to avoid injecting user input into innerHTML
                 searchResultsDiv.innerHTML = '';
@@ -355,13 +415,8 @@ let fragmentAliasMap = null;
                 infoDiv.className = 'search-info';
                 infoDiv.textContent = `No concepts found matching "${searchTerm}".`;
 
-                const clearDiv = document.createElement('div');
-                clearDiv.className = 'clear-search';
-                clearDiv.textContent = 'Clear Search';
-                clearDiv.onclick = clearSearch;
-
                 searchResultsDiv.appendChild(infoDiv);
-                searchResultsDiv.appendChild(clearDiv);
+                searchResultsDiv.appendChild(buildClearSearchNode());
                 searchResultsDiv.classList.add('show');
             }
         }
@@ -378,27 +433,13 @@ let fragmentAliasMap = null;
             const safeIndex = Math.min(Math.max(pathIndex, 0), paths.length - 1);
             const path = paths[safeIndex];
 
-            // First, collapse everything
-            document.querySelectorAll('.concept-children.expanded').forEach(el => {
-                el.classList.remove('expanded');
-            });
-            document.querySelectorAll('.concept-header.active').forEach(el => {
-                el.classList.remove('active');
-            });
-            document.querySelectorAll('.toggle-icon.expanded').forEach(el => {
-                el.classList.remove('expanded');
-            });
-            document.querySelectorAll('.concept-definition.show').forEach(el => {
-                el.classList.remove('show');
-            });
-            document.querySelectorAll('.exact-match-info.show').forEach(el => {
-                el.classList.remove('show');
-            });
-            document.querySelectorAll('.close-match-info.show').forEach(el => {
-                el.classList.remove('show');
-            });
-            document.querySelectorAll('.procedures-section.show').forEach(el => {
-                el.classList.remove('show');
+            // First, collapse everything (one pass over the mind map; classes an
+            // element does not have are ignored by classList.remove)
+            document.getElementById('mindmap').querySelectorAll(
+                '.concept-children.expanded, .concept-header.active, .toggle-icon.expanded, ' +
+                '.concept-definition.show, .exact-match-info.show, .close-match-info.show, .procedures-section.show'
+            ).forEach(el => {
+                el.classList.remove('expanded', 'active', 'show');
             });
 
             // Clear previous highlights
@@ -408,14 +449,12 @@ let fragmentAliasMap = null;
             for (let i = 0; i < path.length - 1; i++) {
                 const conceptUri = path[i].uri;
                 const pathKeyValue = pathKeyEncoded(path.slice(0, i + 1));
-                const conceptElement = document.querySelector(`.concept[data-path-key="${pathKeyValue}"]`)
-                    || document.querySelector(`.concept[data-uri="${conceptUri}"]`);
+                const conceptElement = conceptElements.get(pathKeyValue)
+                    || document.querySelector(`.concept[data-uri="${CSS.escape(conceptUri)}"]`);
 
                 if (conceptElement) {
-                    const header = conceptElement.querySelector('.concept-header');
-                    const children = conceptElement.querySelectorAll(':scope > .concept-children');
-                    const icon = header.querySelector('.toggle-icon');
-                    const procedures = conceptElement.querySelector(':scope > .procedures-section');
+                    renderChildren(conceptElement);
+                    const { header, children, icon, procedures, procChildren } = getConceptParts(conceptElement);
 
                     children.forEach(childDiv => {
                         if (!childDiv.classList.contains('expanded')) {
@@ -430,7 +469,6 @@ let fragmentAliasMap = null;
 
                     if (procedures) {
                         procedures.classList.add('show');
-                        const procChildren = procedures.querySelector('.concept-children');
                         if (procChildren) {
                             procChildren.classList.add('expanded');
                         }
@@ -440,32 +478,30 @@ let fragmentAliasMap = null;
 
             // Highlight and scroll to the target concept
             const targetPathKey = pathKeyEncoded(path);
-            const targetElement = document.querySelector(`.concept[data-path-key="${targetPathKey}"]`)
-                || document.querySelector(`.concept[data-uri="${targetUri}"]`);
+            const targetElement = conceptElements.get(targetPathKey)
+                || document.querySelector(`.concept[data-uri="${CSS.escape(targetUri)}"]`);
             if (targetElement) {
-                const targetHeader = targetElement.querySelector('.concept-header');
+                renderChildren(targetElement);
+                const {
+                    header: targetHeader, definition, exactMatch, closeMatch, procedures, procChildren
+                } = getConceptParts(targetElement);
                 targetHeader.classList.add('highlighted');
 
                 // Show definition, exact match, procedures if exists
-                const definition = targetElement.querySelector(':scope > .concept-definition');
                 if (definition) {
                     definition.classList.add('show');
                 }
 
-                const exactMatch = targetElement.querySelector(':scope > .exact-match-info');
                 if (exactMatch) {
                     exactMatch.classList.add('show');
                 }
 
-                const closeMatch = targetElement.querySelector(':scope > .close-match-info');
                 if (closeMatch) {
                     closeMatch.classList.add('show');
                 }
 
-                const procedures = targetElement.querySelector(':scope > .procedures-section');
                 if (procedures) {
                     procedures.classList.add('show');
-                    const procChildren = procedures.querySelector('.concept-children');
                     if (procChildren) {
                         procChildren.classList.add('expanded');
                     }
@@ -499,9 +535,11 @@ fetch('assets/soilvoc_data.json')
     .then(data => {
         vocabularyData = data.vocabulary;
         fragmentAliasMap = data.fragment_alias_map;
+        concepts = data.concepts;
+        viewerStats = data.stats;
         document.getElementById('version-tag').textContent = data.version || '';
 
-        buildConceptMap(vocabularyData.top_concepts);
+        buildConceptMap(data.search_index);
         renderMindmap();
         renderStats();
         handleHashNavigation();
@@ -510,9 +548,14 @@ fetch('assets/soilvoc_data.json')
             handleHashNavigation();
         });
 
-        // Search results click handling (paths + items)
+        // Search results click handling (paths + items + clear)
         const searchResultsDiv = document.getElementById('searchResults');
         searchResultsDiv.addEventListener('click', (e) => {
+            if (e.target.closest('.clear-search')) {
+                clearSearch();
+                return;
+            }
+
             const pathItem = e.target.closest('.search-result-path-item');
             if (pathItem && searchResultsDiv.contains(pathItem)) {
                 e.stopPropagation();
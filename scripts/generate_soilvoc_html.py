@@ -10,33 +10,143 @@ Generate enhanced interactive HTML mind map from SoilVoc.ttl with:
 
 import argparse
 import json
+from html import escape
 import traceback
 from pathlib import Path
 
-from rdflib import BNode, Graph, Namespace, URIRef
-from rdflib.namespace import DCTERMS, RDF, RDFS, SDO, SKOS, SOSA
+from rdflib import BNode, Graph, Literal, Namespace, URIRef
+from rdflib.namespace import DCTERMS, RDF, RDFS, SDO, SKOS, SOSA, XSD
+
+try:
+    import pyoxigraph
+except ImportError:  # optional: native Turtle parser, rdflib is used otherwise
+    pyoxigraph = None
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 DEFAULT_TTL_PATH = REPO_ROOT / "SoilVoc.ttl"
 DEFAULT_OUTPUT_DIR = REPO_ROOT / "assets"
 DEFAULT_VERSION_FILE = DEFAULT_OUTPUT_DIR / "VERSION"
 
+# rdflib's SOSA namespace does not declare hasProcedure
+HAS_PROCEDURE = URIRef(str(SOSA) + "hasProcedure")
+
+# Predicates looked up per subject (subject -> objects) ...
+FORWARD_PREDICATES = (
+    SKOS.prefLabel, SKOS.altLabel, SKOS.notation, SKOS.definition,
+    SKOS.exactMatch, SKOS.closeMatch, SKOS.narrower, SKOS.hasTopConcept,
+    HAS_PROCEDURE, DCTERMS.source, SDO.text, RDF.value, RDFS.label,
+)
+# ... and predicates looked up per object (object -> subjects)
+INVERSE_PREDICATES = (RDF.type, SKOS.broader, SKOS.topConceptOf)
+
+
+def _local_name(uri):
+    """Return the part of a URI after its last '/' and then its last '#'."""
+    return uri.rpartition('/')[2].rpartition('#')[2]
+
+
+def _index_rdflib_graph(ttl_file_path):
+    """Parse a Turtle file with rdflib and index the triples used by the viewer."""
+    g = Graph()
+    g.parse(ttl_file_path, format='turtle')
+
+    # Walking subject by subject keeps the object order of g.objects();
+    # whole-graph iteration order is not stable across runs. This is also
+    # why the index is not built from one SPARQL SELECT: rdflib's engine
+    # yields rows in store order and is over ten times slower than this walk.
+    forward = {p: {} for p in FORWARD_PREDICATES}
+    for s in g.subjects(unique=True):
+        for p, o in g.predicate_objects(s):
+            by_subject = forward.get(p)
+            if by_subject is not None:
+                by_subject.setdefault(s, []).append(o)
+
+    inverse = {p: {} for p in INVERSE_PREDICATES}
+    for p, by_object in inverse.items():
+        for s, o in g.subject_objects(p):
+            by_object.setdefault(o, []).append(s)
+
+    return forward, inverse
+
+
+def _from_oxigraph(term):
+    """Convert a pyoxigraph term into the equivalent rdflib term."""
+    if isinstance(term, pyoxigraph.NamedNode):
+        return URIRef(term.value)
+    if isinstance(term, pyoxigraph.BlankNode):
+        return BNode(term.value)
+    if term.language:
+        return Literal(term.value, lang=term.language)
+    if term.datatype.value == str(XSD.string):
+        return Literal(term.value)
+    return Literal(term.value, datatype=URIRef(term.datatype.value))
+
+
+def _index_oxigraph_stream(ttl_file_path):
+    """Index the triples used by the viewer straight from pyoxigraph's Turtle parser.
+
+    Triples arrive in document order, which is also the order rdflib inserts
+    them in, so both indexes list objects and subjects identically.
+    """
+    forward = {p: {} for p in FORWARD_PREDICATES}
+    inverse = {p: {} for p in INVERSE_PREDICATES}
+    forward_by_iri = {str(p): forward[p] for p in FORWARD_PREDICATES}
+    inverse_by_iri = {str(p): inverse[p] for p in INVERSE_PREDICATES}
+
+    seen = set()
+    for quad in pyoxigraph.parse(path=str(ttl_file_path), format=pyoxigraph.RdfFormat.TURTLE):
+        predicate_iri = quad.predicate.value
+        by_subject = forward_by_iri.get(predicate_iri)
+        by_object = inverse_by_iri.get(predicate_iri)
+        if by_subject is None and by_object is None:
+            continue
+
+        s = _from_oxigraph(quad.subject)
+        o = _from_oxigraph(quad.object)
+        key = (predicate_iri, s, o)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        if by_subject is not None:
+            by_subject.setdefault(s, []).append(o)
+        else:
+            by_object.setdefault(o, []).append(s)
+
+    return forward, inverse
+
+
 def parse_skos_vocabulary_enhanced(ttl_file_path):
     """
     Parse a SKOS vocabulary from a Turtle file and extract the hierarchy with procedures.
 
+    The file is parsed with pyoxigraph when it is installed and with rdflib
+    otherwise; either way the triples are indexed once and every concept
+    lookup below is a dict hit.
+
     Args:
         ttl_file_path: Path to the .ttl file
 
     Returns:
         dict: Dictionary containing the vocabulary structure
     """
-    # Load the graph
-    g = Graph()
-    g.parse(ttl_file_path, format='turtle')
+    if pyoxigraph is not None:
+        forward, inverse = _index_oxigraph_stream(ttl_file_path)
+    else:
+        forward, inverse = _index_rdflib_graph(ttl_file_path)
+
+    def objects(subject, predicate):
+        return forward[predicate].get(subject, [])
+
+    def value(subject, predicate):
+        values = forward[predicate].get(subject)
+        return values[0] if values else None
+
+    def subjects(predicate, obj):
+        return inverse[predicate].get(obj, [])
 
     # Find the ConceptScheme
-    concept_schemes = list(g.subjects(RDF.type, SKOS.ConceptScheme))
+    concept_schemes = subjects(RDF.type, SKOS.ConceptScheme)
 
     if not concept_schemes:
         raise ValueError("No SKOS ConceptScheme found in the file")
@@ -45,32 +155,56 @@ def parse_skos_vocabulary_enhanced(ttl_file_path):
     scheme = concept_schemes[0]
 
     # Get scheme information
-    scheme_label = str(g.value(scheme, SKOS.prefLabel) or
-                      g.value(scheme, RDFS.label) or
-                      scheme.split('/')[-1].split('#')[-1])
-
-    # Find top concepts
-    top_concepts = []
+    label = value(scheme, SKOS.prefLabel) or value(scheme, RDFS.label)
+    scheme_label = str(label) if label else _local_name(scheme)
 
-    # Try hasTopConcept property
-    for top_concept in g.objects(scheme, SKOS.hasTopConcept):
-        top_concepts.append(top_concept)
-
-    # Try topConceptOf property (inverse)
-    for top_concept in g.subjects(SKOS.topConceptOf, scheme):
-        if top_concept not in top_concepts:
-            top_concepts.append(top_concept)
+    # Find top concepts via hasTopConcept and its inverse topConceptOf;
+    # dict.fromkeys drops duplicates while keeping the first-seen order
+    top_concepts = list(dict.fromkeys([
+        *objects(scheme, SKOS.hasTopConcept),
+        *subjects(SKOS.topConceptOf, scheme),
+    ]))
 
     # If no top concepts found, find concepts with no broader concepts
     if not top_concepts:
-        all_concepts = set(g.subjects(RDF.type, SKOS.Concept))
-        concepts_with_broader = set(g.subjects(SKOS.broader, None))
-        top_concepts = list(all_concepts - concepts_with_broader)
+        concepts_with_broader = {
+            concept
+            for narrower in inverse[SKOS.broader].values()
+            for concept in narrower
+        }
+        top_concepts = [
+            concept for concept in dict.fromkeys(subjects(RDF.type, SKOS.Concept))
+            if concept not in concepts_with_broader
+        ]
+
+    # Per-predicate maps read for every concept, resolved once up front
+    pref_labels = forward[SKOS.prefLabel]
+    alt_labels = forward[SKOS.altLabel]
+    notations = forward[SKOS.notation]
+    definitions_of = forward[SKOS.definition]
+    exact_matches_of = forward[SKOS.exactMatch]
+    close_matches_of = forward[SKOS.closeMatch]
+    narrower_of = forward[SKOS.narrower]
+    procedures_of = forward[HAS_PROCEDURE]
+    sources_of = forward[DCTERMS.source]
+    values_of = forward[RDF.value]
+    texts_of = forward[SDO.text]
+    broader_inverse = inverse[SKOS.broader]
+
+    # Procedures are concepts with an exactMatch into the GloSIS procedure codelists
+    procedure_concepts = {
+        concept
+        for concept, matches in exact_matches_of.items()
+        if any('glosis/model/procedure/' in match for match in matches)
+    }
+
+    def first(values):
+        return values[0] if values else None
 
     def pick_text_literal(defn_node):
-        texts = list(g.objects(defn_node, RDF.value))
+        texts = values_of.get(defn_node)
         if not texts:
-            texts = list(g.objects(defn_node, SDO.text))
+            texts = texts_of.get(defn_node)
         if not texts:
             return None
         for t in texts:
@@ -98,25 +232,34 @@ def parse_skos_vocabulary_enhanced(ttl_file_path):
 
     def _get_match_local_id(match_uri: str) -> str:
         if "#" in match_uri:
-            return match_uri.split("#")[-1]
-        return match_uri.rstrip("/").split("/")[-1]
+            return match_uri.rpartition("#")[2]
+        return match_uri.rstrip("/").rpartition("/")[2]
+
+    # Concepts reachable from several parents (shared procedures in particular)
+    # are materialized once and the same dict is referenced from every parent.
+    info_cache = {}
+    visiting = set()
 
     def get_concept_info(concept_uri):
         """Extract information about a concept."""
-        pref_label = g.value(concept_uri, SKOS.prefLabel)
-        alt_label = g.value(concept_uri, SKOS.altLabel)
-        notation = g.value(concept_uri, SKOS.notation)
+        cached = info_cache.get(concept_uri)
+        if cached is not None:
+            return cached
+
+        pref_label = first(pref_labels.get(concept_uri))
+        alt_label = first(alt_labels.get(concept_uri))
+        notation = first(notations.get(concept_uri))
 
-        label = str(pref_label or concept_uri.split('/')[-1].split('#')[-1])
+        label = str(pref_label or _local_name(concept_uri))
         alt_label_str = str(alt_label) if alt_label else None
 
         # Get definitions and sources (blank node structure)
         definitions = []
-        for defn in g.objects(concept_uri, SKOS.definition):
+        for defn in definitions_of.get(concept_uri, ()):
             if isinstance(defn, BNode):
                 text_literal = pick_text_literal(defn)
                 text = str(text_literal) if text_literal else None
-                source_val = g.value(defn, DCTERMS.source)
+                source_val = first(sources_of.get(defn))
                 source = str(source_val) if source_val else None
                 if text:
                     definitions.append({
@@ -131,7 +274,7 @@ def parse_skos_vocabulary_enhanced(ttl_file_path):
 
         # Get exactMatch links
         exact_matches = []
-        for match_uri in g.objects(concept_uri, SKOS.exactMatch):
+        for match_uri in exact_matches_of.get(concept_uri, ()):
             match_str = str(match_uri)
             source_label = _get_match_source_label(match_str)
             local_id = _get_match_local_id(match_str)
@@ -146,7 +289,7 @@ def parse_skos_vocabulary_enhanced(ttl_file_path):
 
         # Get closeMatch links
         close_matches = []
-        for match_uri in g.objects(concept_uri, SKOS.closeMatch):
+        for match_uri in close_matches_of.get(concept_uri, ()):
             match_str = str(match_uri)
             source_label = _get_match_source_label(match_str)
             local_id = _get_match_local_id(match_str)
@@ -159,20 +302,22 @@ def parse_skos_vocabulary_enhanced(ttl_file_path):
                 'label': match_label
             })
 
-        # Check if this is a procedure (exactMatch to glosis_proc)
-        is_procedure = any('glosis/model/procedure/' in m['uri'] for m in exact_matches)
+        is_procedure = concept_uri in procedure_concepts
 
-        # Get narrower concepts
-        narrower = list(g.objects(concept_uri, SKOS.narrower))
+        # Get narrower concepts, plus concepts that have this as broader (inverse)
+        narrower = dict.fromkeys([
+            *narrower_of.get(concept_uri, ()),
+            *broader_inverse.get(concept_uri, ()),
+        ])
 
-        # Also check for concepts that have this as broader (inverse)
-        for concept in g.subjects(SKOS.broader, concept_uri):
-            if concept not in narrower:
-                narrower.append(concept)
+        # Concepts on the current descent path are skipped to break cycles
+        visiting.add(concept_uri)
 
         # Get procedures linked via sosa:hasProcedure
         procedures = []
-        for proc_uri in g.objects(concept_uri, SOSA.hasProcedure):
+        for proc_uri in procedures_of.get(concept_uri, ()):
+            if proc_uri in visiting:
+                continue
             proc_info = get_concept_info(proc_uri)
             procedures.append(proc_info)
 
@@ -181,15 +326,16 @@ def parse_skos_vocabulary_enhanced(ttl_file_path):
             'label': label,
             'altLabel': alt_label_str,
             'notation': str(notation) if notation else None,
-            'definition': definitions[0]['text'] if definitions else None,
             'definitions': definitions,
             'exactMatch': exact_matches,
             'closeMatch': close_matches,
             'isProcedure': is_procedure,
             'procedures': procedures,
-            'narrower': [get_concept_info(n) for n in narrower] if narrower else []
+            'narrower': [get_concept_info(n) for n in narrower if n not in visiting]
         }
 
+        visiting.discard(concept_uri)
+        info_cache[concept_uri] = concept_info
         return concept_info
 
     # Build the structure
@@ -235,9 +381,115 @@ def build_fragment_alias_map(vocabulary_data):
     return alias_map
 
 
+def _escape_optional(text):
+    return escape(text) if text else text
+
+
+def _escape_matches(matches):
+    return [{'uri': escape(m['uri']), 'label': escape(m['label'])} for m in matches or []]
+
+
+def build_concept_table(vocabulary_data):
+    """
+    Flatten the concept tree into a table keyed by concept URI.
+
+    Concepts reachable from several parents are stored once; parents refer to
+    their narrower concepts and procedures by URI. Text shown by the viewer is
+    HTML-escaped here, so the viewer inserts it into markup as is; the key stays
+    the raw URI and uriHtml carries its escaped form for attributes.
+
+    Returns:
+        tuple: (concepts dict keyed by URI, list of top concept URIs)
+    """
+    concepts = {}
+
+    def visit_concepts(concept_list):
+        for concept in concept_list:
+            uri = concept['uri']
+            if uri in concepts:
+                continue
+            narrower = concept.get('narrower') or []
+            procedures = concept.get('procedures') or []
+            concepts[uri] = {
+                'uriHtml': escape(uri),
+                'label': escape(concept['label']),
+                'altLabel': _escape_optional(concept.get('altLabel')),
+                'notation': _escape_optional(concept.get('notation')),
+                'definitions': [
+                    {'text': escape(d['text']), 'source': _escape_optional(d['source'])}
+                    for d in concept.get('definitions') or []
+                ],
+                'exactMatch': _escape_matches(concept.get('exactMatch')),
+                'closeMatch': _escape_matches(concept.get('closeMatch')),
+                'isProcedure': concept.get('isProcedure', False),
+                'narrower': [child['uri'] for child in narrower],
+                'procedures': [proc['uri'] for proc in procedures],
+            }
+            visit_concepts(narrower)
+            visit_concepts(procedures)
+
+    top_concepts = vocabulary_data.get('top_concepts', [])
+    visit_concepts(top_concepts)
+    return concepts, [concept['uri'] for concept in top_concepts]
+
+
+def build_search_index(vocabulary_data):
+    """
+    Flatten the concept tree into the viewer's search index and statistics.
+
+    Every concept appears once, in depth-first order, with each distinct path
+    that reaches it stored as the index positions of its ancestors. Entries
+    carry the raw, unescaped label, altLabel and notation for matching; the
+    escaped copies in the concept table are only used for rendering.
+
+    Returns:
+        tuple: (search_index list, stats dict)
+    """
+    search_index = []
+    positions = {}
+    seen_paths = set()
+    max_depth = 1
+
+    def visit_concepts(concepts, ancestors):
+        nonlocal max_depth
+        for concept in concepts:
+            uri = concept['uri']
+            position = positions.get(uri)
+            if position is None:
+                position = positions[uri] = len(search_index)
+                search_index.append({
+                    'uri': uri,
+                    'label': concept['label'],
+                    'altLabel': concept.get('altLabel') or None,
+                    'notation': concept.get('notation') or None,
+                    'paths': [],
+                })
+
+            path_key = (position, tuple(ancestors))
+            if path_key in seen_paths:
+                continue
+            seen_paths.add(path_key)
+            search_index[position]['paths'].append(list(ancestors))
+            max_depth = max(max_depth, len(ancestors) + 1)
+
+            path = ancestors + [position]
+            visit_concepts(concept.get('narrower') or [], path)
+            visit_concepts(concept.get('procedures') or [], path)
+
+    top_concepts = vocabulary_data.get('top_concepts', [])
+    visit_concepts(top_concepts, [])
+
+    stats = {
+        'top_concepts': len(top_concepts),
+        'total_concepts': len(search_index),
+        'max_depth': max_depth,
+    }
+    return search_index, stats
+
+
 def generate_viewer_data(vocabulary_data, output_dir=DEFAULT_OUTPUT_DIR, version=None):
     """
-    Write vocabulary data as JSON for the viewer.
+    Write vocabulary data as compact JSON for the viewer.
 
     The static viewer shell lives at the repository root and loads
     assets/soilvoc_data.json at runtime. Only soilvoc_data.json is written here.
@@ -248,16 +500,25 @@ def generate_viewer_data(vocabulary_data, output_dir=DEFAULT_OUTPUT_DIR, version
         version: Optional version string (e.g. "v0.2.0") injected into the JSON
     """
     fragment_alias_map = build_fragment_alias_map(vocabulary_data)
+    concepts, top_uris = build_concept_table(vocabulary_data)
+    search_index, stats = build_search_index(vocabulary_data)
     payload = {
         'version': version or 'unknown',
-        'vocabulary': vocabulary_data,
+        'vocabulary': {
+            'scheme_uri': vocabulary_data['scheme_uri'],
+            'scheme_label': vocabulary_data['scheme_label'],
+            'top_uris': top_uris,
+        },
+        'concepts': concepts,
         'fragment_alias_map': fragment_alias_map,
+        'search_index': search_index,
+        'stats': stats,
     }
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     out_path = output_dir / 'soilvoc_data.json'
     with out_path.open('w', encoding='utf-8') as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+        json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
     print(f"Vocabulary data written: {out_path}")
     return out_path
 
@@ -925,8 +1186,8 @@ def _generate_html_mindmap_enhanced_LEGACY(vocabulary_data, output_file='index.h
     </div>
 
     <script>
-        const vocabularyData = {json.dumps(vocabulary_data, indent=2)};
-        const fragmentAliasMap = {json.dumps(fragment_alias_map, indent=2)};
+        const vocabularyData = {json.dumps(vocabulary_data, ensure_ascii=False, separators=(',', ':'))};
+        const fragmentAliasMap = {json.dumps(fragment_alias_map, ensure_ascii=False, separators=(',', ':'))};
 
         let allConcepts = [];
         let uniqueConceptUris = new Set();
@@ -1,13 +1,25 @@
 import argparse
 import csv
+import hashlib
+import heapq
+import pickle
 import re
+import sys
 from collections import defaultdict
+from collections.abc import Iterator
+from functools import lru_cache
 from pathlib import Path
 
+import rdflib
 from rdflib import BNode, Graph, Literal, Namespace, URIRef
-from rdflib.namespace import DCTERMS, RDF, SKOS, SOSA
+from rdflib.namespace import DCTERMS, RDF, SKOS, SOSA, XSD
 from rdflib.compare import graph_diff, isomorphic, to_isomorphic
 
+try:
+    import pyoxigraph
+except ImportError:  # optional: native canonicalization, rdflib.compare is used otherwise
+    pyoxigraph = None
+
 REPO_ROOT = Path(__file__).resolve().parent.parent
 EUSOILVOC_SCHEME_URI = "https://w3id.org/eusoilvoc"
 EUSOILVOC_NAMESPACE = Namespace(f"{EUSOILVOC_SCHEME_URI}#")
@@ -28,6 +40,12 @@ IS_PROCEDURE_FOR = URIRef(str(SOSA) + "isProcedureFor")
 OBSERVABLE_PROPERTY = URIRef(str(SOSA) + "ObservableProperty")
 PROCEDURE_CLASS = URIRef(str(SOSA) + "Procedure")
 
+# A concept is a procedure if any of its skos:exactMatch URIs is in the GLOSIS procedure namespace.
+PROCEDURE_EXACTMATCH_PREFIXES = (
+    "http://w3id.org/glosis/model/procedure/",
+    "http://w3id.org/glosis/model/procedure",
+)
+
 
 COLUMN_ALIASES: dict[str, list[str]] = {
     COL_ID: [
@@ -85,9 +103,20 @@ REQUIRED_COLUMNS: tuple[str, ...] = (
 
 OPTIONAL_COLUMNS: tuple[str, ...] = (COL_IS_PROCEDURE_FOR,)
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
 
+@lru_cache(maxsize=None)
 def _norm_col(name: str) -> str:
-    return re.sub(r"\s+", "", str(name)).casefold()
+    return _WHITESPACE_RE.sub("", str(name)).casefold()
+
+
+# Normalized alias -> (canonical column, alias priority). Lower priority wins
+# when a CSV carries several headers that alias the same canonical column.
+_NORM_ALIAS_TO_CANONICAL: dict[str, tuple[str, int]] = {}
+for _canonical, _aliases in COLUMN_ALIASES.items():
+    for _rank, _alias in enumerate(_aliases):
+        _NORM_ALIAS_TO_CANONICAL.setdefault(_norm_col(_alias), (_canonical, _rank))
 
 
 def canonicalize_fieldnames(fieldnames: list[str] | None) -> dict[str, str]:
@@ -95,22 +124,18 @@ def canonicalize_fieldnames(fieldnames: list[str] | None) -> dict[str, str]:
     if not fieldnames:
         raise ValueError("CSV has no header row")
 
-    norm_to_actual: dict[str, str] = {_norm_col(c): c for c in fieldnames}
-    rename_map: dict[str, str] = {}
+    best: dict[str, tuple[int, str]] = {}
+    for actual in fieldnames:
+        match = _NORM_ALIAS_TO_CANONICAL.get(_norm_col(actual))
+        if match is None:
+            continue
+        canonical, rank = match
+        current = best.get(canonical)
+        if current is None or rank <= current[0]:
+            best[canonical] = (rank, actual)
 
-    missing: list[str] = []
-    for canonical, aliases in COLUMN_ALIASES.items():
-        found_actual = None
-        for candidate in aliases:
-            actual = norm_to_actual.get(_norm_col(candidate))
-            if actual is not None:
-                found_actual = actual
-                break
-        if found_actual is None:
-            if canonical in REQUIRED_COLUMNS:
-                missing.append(canonical)
-        else:
-            rename_map[found_actual] = canonical
+    rename_map: dict[str, str] = {actual: canonical for canonical, (_, actual) in best.items()}
+    missing = [c for c in COLUMN_ALIASES if c in REQUIRED_COLUMNS and c not in best]
 
     if missing:
         raise ValueError(
@@ -121,18 +146,29 @@ def canonicalize_fieldnames(fieldnames: list[str] | None) -> dict[str, str]:
     return rename_map
 
 
-def read_rows(csv_path: Path) -> list[dict[str, str]]:
+def read_rows(csv_path: Path) -> Iterator[dict[str, str]]:
+    """Yield CSV rows keyed by canonical column name.
+
+    Only columns present in the CSV are set; read them with ``row.get(COL_X, "")``.
+    """
     with csv_path.open("r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        rename_map = canonicalize_fieldnames(reader.fieldnames)
+        reader = csv.reader(f)
+        fieldnames = next(reader, None)
+        rename_map = canonicalize_fieldnames(fieldnames)
+
+        # Read cells by position rather than building a DictReader dict per row.
+        # Like DictReader, a repeated header name resolves to its last column.
+        position = {name: idx for idx, name in enumerate(fieldnames)}
+        columns = [(position[actual], canonical) for actual, canonical in rename_map.items()]
 
-        rows: list[dict[str, str]] = []
         for raw in reader:
-            row: dict[str, str] = {k: "" for k in COLUMN_ALIASES.keys()}
-            for actual_key, canonical_key in rename_map.items():
-                row[canonical_key] = str(raw.get(actual_key, "") or "").strip()
-            rows.append(row)
-        return rows
+            if not raw:
+                continue
+            width = len(raw)
+            yield {
+                canonical: raw[idx].strip() if idx < width else ""
+                for idx, canonical in columns
+            }
 
 
 def split_values(value: str, allow_legacy_semicolon: bool = True) -> list[str]:
@@ -146,70 +182,28 @@ def split_values(value: str, allow_legacy_semicolon: bool = True) -> list[str]:
     elif allow_legacy_semicolon and ";" in value:
         parts = value.split(";")
     else:
-        parts = [value]
-    parts = [p.strip() for p in parts]
-    return [p for p in parts if p]
-
-
-def _graph_without_predicates(g: Graph, predicates: set[URIRef]) -> Graph:
-    if not predicates:
-        return g
-    g2 = Graph()
-    g2.namespace_manager = g.namespace_manager
-    for s, p, o in g:
-        if p in predicates:
-            continue
-        g2.add((s, p, o))
-    return g2
+        # Single value, already stripped and non-empty.
+        return [value]
+    return [p for p in map(str.strip, parts) if p]
 
 
-def build_graph_from_csv(csv_path: Path, scheme_uri: str) -> tuple[Graph, dict[str, str]]:
-    rows = read_rows(csv_path)
+def _triples_without_predicates(g: Graph, predicates: set[URIRef]) -> set[tuple]:
+    """Return the triples of ``g`` whose predicate is not in ``predicates``."""
+    return {t for t in g if t[1] not in predicates}
 
-    PROCEDURE_EXACTMATCH_PREFIXES = (
-        "http://w3id.org/glosis/model/procedure/",
-        "http://w3id.org/glosis/model/procedure",
-    )
-
-    # Determine which concepts are procedures.
-    # Rule: if any skos:exactMatch URI starts with the GLOSIS procedure namespace, it's a procedure.
-    procedure_concept_uris: set[str] = set()
-    for row in rows:
-        concept_uri = str(row[COL_ID]).strip()
-        if not concept_uri:
-            continue
-        exacts = split_values(str(row[COL_EXACT]))
-        if any(u.startswith(PROCEDURE_EXACTMATCH_PREFIXES) for u in exacts):
-            procedure_concept_uris.add(concept_uri)
 
-    # Build lookup for mapping prefLabels -> concept URIs
-    pref_to_uris: defaultdict[str, list[str]] = defaultdict(list)
-    for row in rows:
-        uri = str(row[COL_ID]).strip()
-        pref = str(row[COL_PREF]).strip()
-        if not uri:
-            continue
-        if pref:
-            pref_to_uris[pref.casefold()].append(uri)
+def _as_graph(triples) -> Graph:
+    """Return ``triples`` as a Graph, bulk-copying them only if they are not one already."""
+    if isinstance(triples, Graph):
+        return triples
+    g = Graph()
+    g.addN((s, p, o, g) for s, p, o in triples)
+    return g
 
-    warnings: dict[str, str] = {}
 
-    def resolve_pref_to_uri(pref_label: str, relation_name: str) -> str | None:
-        key = pref_label.casefold()
-        uris = pref_to_uris.get(key, [])
-        if not uris:
-            unresolved_key = f"unresolved_{relation_name}_labels"
-            warnings.setdefault(unresolved_key, "")
-            warnings[unresolved_key] += f"- {pref_label}\n"
-            return None
-        if len(uris) > 1:
-            ambiguous_key = f"ambiguous_{relation_name}_labels"
-            warnings.setdefault(ambiguous_key, "")
-            warnings[ambiguous_key] += (
-                f"- {pref_label} -> {len(uris)} URIs; using lexicographically smallest\n"
-            )
-            return sorted(uris)[0]
-        return uris[0]
+def build_graph_from_csv(csv_path: Path, scheme_uri: str) -> tuple[Graph, dict[str, str]]:
+    # Warning lines are collected per key and joined once at the end.
+    warning_lines: defaultdict[str, list[str]] = defaultdict(list)
 
     g = Graph()
 
@@ -221,127 +215,289 @@ def build_graph_from_csv(csv_path: Path, scheme_uri: str) -> tuple[Graph, dict[s
     if scheme_uri == EUSOILVOC_SCHEME_URI:
         g.bind("eusoilvoc", EUSOILVOC_NAMESPACE)
 
+    # Triples are collected as quads and added to the store in one addN call.
+    quads: list[tuple] = []
+
     # Create concept scheme (CSV doesn't carry scheme metadata beyond URI)
-    g.add((SCHEME_URI, RDF.type, SKOS.ConceptScheme))
+    quads.append((SCHEME_URI, RDF.type, SKOS.ConceptScheme, g))
+
+    # Single pass over the CSV: emit concepts + literals + match links directly, and
+    # buffer the label-based links until every prefLabel has been indexed.
+    pref_to_uris: defaultdict[str, list[str]] = defaultdict(list)
+    # One URIRef per concept, reused when the concept is the target of a later link.
+    concept_terms: dict[str, URIRef] = {}
+    procedure_concept_uris: set[str] = set()
+    top_concept_uris_from_csv: set[str] = set()
+    broader_todo: list[tuple[URIRef, list[str]]] = []
+    is_procedure_for_todo: list[tuple[URIRef, list[str]]] = []
 
-    # Create concepts + literals + match links
-    for row in rows:
-        concept_uri = str(row[COL_ID]).strip()
+    for row in read_rows(csv_path):
+        concept_uri = row.get(COL_ID, "")
         if not concept_uri:
             continue
-        concept = URIRef(concept_uri)
+        concept = concept_terms.get(concept_uri)
+        if concept is None:
+            concept = concept_terms[concept_uri] = URIRef(concept_uri)
+        pref = row.get(COL_PREF, "")
+        broader_raw = row.get(COL_BROADER, "")
+        exacts = split_values(row.get(COL_EXACT, ""))
 
-        g.add((concept, RDF.type, SKOS.Concept))
-        g.add((concept, SKOS.inScheme, SCHEME_URI))
+        if pref:
+            pref_to_uris[pref.casefold()].append(concept_uri)
+
+        # Rule: if any skos:exactMatch URI starts with the GLOSIS procedure namespace, it's a procedure.
+        for uri in exacts:
+            if uri.startswith(PROCEDURE_EXACTMATCH_PREFIXES):
+                procedure_concept_uris.add(concept_uri)
+                break
+
+        # Infer top concepts: all non-procedure concepts with no skos:broader.
+        # For this project we treat: blank CSV "broader" => top concept.
+        # (We only record skos:broader in CSV; procedures are excluded.)
+        if not broader_raw:
+            top_concept_uris_from_csv.add(concept_uri)
+
+        quads.append((concept, RDF.type, SKOS.Concept, g))
+        quads.append((concept, SKOS.inScheme, SCHEME_URI, g))
 
-        pref = str(row[COL_PREF]).strip()
         if pref:
-            g.add((concept, SKOS.prefLabel, Literal(pref, lang="en")))
+            quads.append((concept, SKOS.prefLabel, Literal(pref, lang="en"), g))
 
-        for alt in split_values(str(row[COL_ALT])):
-            g.add((concept, SKOS.altLabel, Literal(alt, lang="en")))
+        for alt in split_values(row.get(COL_ALT, "")):
+            quads.append((concept, SKOS.altLabel, Literal(alt, lang="en"), g))
 
-        definitions = split_values(str(row[COL_DEF]), allow_legacy_semicolon=False)
-        sources = split_values(str(row[COL_SOURCE]), allow_legacy_semicolon=False)
+        definitions = split_values(row.get(COL_DEF, ""), allow_legacy_semicolon=False)
+        sources = split_values(row.get(COL_SOURCE, ""), allow_legacy_semicolon=False)
         if sources and len(sources) != len(definitions):
-            warnings.setdefault("definition_source_mismatch", "")
-            warnings["definition_source_mismatch"] += (
+            warning_lines["definition_source_mismatch"].append(
                 f"- {concept_uri}: {len(definitions)} definition(s), {len(sources)} source link(s)\n"
             )
         for idx, definition in enumerate(definitions):
             source = sources[idx] if idx < len(sources) else ""
             if source:
                 bnode = BNode()
-                g.add((concept, SKOS.definition, bnode))
-                g.add((bnode, RDF.value, Literal(definition, lang="en")))
-                g.add((bnode, DCTERMS.source, URIRef(source)))
+                quads.append((concept, SKOS.definition, bnode, g))
+                quads.append((bnode, RDF.value, Literal(definition, lang="en"), g))
+                quads.append((bnode, DCTERMS.source, URIRef(source), g))
             else:
-                g.add((concept, SKOS.definition, Literal(definition, lang="en")))
+                quads.append((concept, SKOS.definition, Literal(definition, lang="en"), g))
 
-        for uri in split_values(str(row[COL_EXACT])):
-            g.add((concept, SKOS.exactMatch, URIRef(uri)))
+        for uri in exacts:
+            quads.append((concept, SKOS.exactMatch, URIRef(uri), g))
 
-        for uri in split_values(str(row[COL_CLOSE])):
-            g.add((concept, SKOS.closeMatch, URIRef(uri)))
+        for uri in split_values(row.get(COL_CLOSE, "")):
+            quads.append((concept, SKOS.closeMatch, URIRef(uri), g))
 
-    # Add broader links from the dedicated broader column only.
-    for row in rows:
-        concept_uri = str(row[COL_ID]).strip()
-        if not concept_uri:
-            continue
-        concept = URIRef(concept_uri)
+        broader_labels = split_values(broader_raw)
+        if broader_labels:
+            broader_todo.append((concept, broader_labels))
+        target_labels = split_values(row.get(COL_IS_PROCEDURE_FOR, ""))
+        if target_labels:
+            is_procedure_for_todo.append((concept, target_labels))
 
-        for broader_label in split_values(str(row[COL_BROADER])):
+    top_concept_uris_from_csv -= procedure_concept_uris
+
+    # Cached: a shared parent label is resolved (and warned about) only once per relation.
+    @lru_cache(maxsize=None)
+    def resolve_pref_to_uri(pref_label: str, relation_name: str) -> str | None:
+        key = pref_label.casefold()
+        uris = pref_to_uris.get(key, [])
+        if not uris:
+            warning_lines[f"unresolved_{relation_name}_labels"].append(f"- {pref_label}\n")
+            return None
+        if len(uris) > 1:
+            warning_lines[f"ambiguous_{relation_name}_labels"].append(
+                f"- {pref_label} -> {len(uris)} URIs; using lexicographically smallest\n"
+            )
+            return sorted(uris)[0]
+        return uris[0]
+
+    # Add broader links from the dedicated broader column only.
+    for concept, broader_labels in broader_todo:
+        for broader_label in broader_labels:
             broader_uri = resolve_pref_to_uri(broader_label, relation_name="broader")
             if broader_uri:
-                broader_concept = URIRef(broader_uri)
-                g.add((concept, SKOS.broader, broader_concept))
+                broader_concept = concept_terms[broader_uri]
+                quads.append((concept, SKOS.broader, broader_concept, g))
+                # Add inferred skos:narrower (original TTL contains these)
+                quads.append((broader_concept, SKOS.narrower, concept, g))
 
-    # Add explicit procedure links from the dedicated isProcedureFor column.
-    for row in rows:
-        concept_uri = str(row[COL_ID]).strip()
-        if not concept_uri:
-            continue
-        concept = URIRef(concept_uri)
+    observable_properties: set[URIRef] = set()
 
-        for target_label in split_values(str(row.get(COL_IS_PROCEDURE_FOR, ""))):
+    # Add explicit procedure links from the dedicated isProcedureFor column.
+    for concept, target_labels in is_procedure_for_todo:
+        for target_label in target_labels:
             target_uri = resolve_pref_to_uri(target_label, relation_name="isprocedurefor")
             if target_uri:
-                target_concept = URIRef(target_uri)
-                g.add((concept, IS_PROCEDURE_FOR, target_concept))
-                g.add((target_concept, HAS_PROCEDURE, concept))
+                target_concept = concept_terms[target_uri]
+                quads.append((concept, IS_PROCEDURE_FOR, target_concept, g))
+                quads.append((target_concept, HAS_PROCEDURE, concept, g))
+                observable_properties.add(target_concept)
 
-    # Infer SOSA class typing from existing triples.
+    # Infer SOSA class typing.
     # 1) Concepts with sosa:hasProcedure are sosa:ObservableProperty.
-    for concept, _, _ in g.triples((None, HAS_PROCEDURE, None)):
-        g.add((concept, RDF.type, OBSERVABLE_PROPERTY))
+    for concept in observable_properties:
+        quads.append((concept, RDF.type, OBSERVABLE_PROPERTY, g))
 
     # 2) Concepts exact-matching glosis procedure URIs are sosa:Procedure.
     for concept_uri in procedure_concept_uris:
-        g.add((URIRef(concept_uri), RDF.type, PROCEDURE_CLASS))
-
-    # Add inferred skos:narrower (original TTL contains these)
-    for child, _, parent in g.triples((None, SKOS.broader, None)):
-        g.add((parent, SKOS.narrower, child))
-
-    # Infer top concepts: all non-procedure concepts with no skos:broader.
-    # For this project we treat: blank CSV "broader" => top concept.
-    # (We only record skos:broader in CSV; procedures are excluded.)
-    top_concept_uris_from_csv: set[str] = set()
-    for row in rows:
-        concept_uri = str(row[COL_ID]).strip()
-        if not concept_uri or concept_uri in procedure_concept_uris:
-            continue
-        broader_raw = str(row[COL_BROADER]).strip()
-        if not broader_raw:
-            top_concept_uris_from_csv.add(concept_uri)
+        quads.append((concept_terms[concept_uri], RDF.type, PROCEDURE_CLASS, g))
 
     for tc_uri in sorted(top_concept_uris_from_csv):
-        tc = URIRef(tc_uri)
-        g.add((SCHEME_URI, SKOS.hasTopConcept, tc))
-        g.add((tc, SKOS.topConceptOf, SCHEME_URI))
+        tc = concept_terms[tc_uri]
+        quads.append((SCHEME_URI, SKOS.hasTopConcept, tc, g))
+        quads.append((tc, SKOS.topConceptOf, SCHEME_URI, g))
 
+    g.addN(quads)
+    warnings = {key: "".join(lines) for key, lines in warning_lines.items()}
     return g, warnings
 
 
+def _to_oxigraph(term):
+    """Convert an rdflib term into the equivalent pyoxigraph term."""
+    if isinstance(term, URIRef):
+        return pyoxigraph.NamedNode(str(term))
+    if isinstance(term, BNode):
+        return pyoxigraph.BlankNode(str(term))
+    if term.language:
+        return pyoxigraph.Literal(str(term), language=term.language)
+    if term.datatype:
+        return pyoxigraph.Literal(str(term), datatype=pyoxigraph.NamedNode(str(term.datatype)))
+    return pyoxigraph.Literal(str(term))
+
+
+def _from_oxigraph(term):
+    """Convert a pyoxigraph term into the equivalent rdflib term."""
+    if isinstance(term, pyoxigraph.NamedNode):
+        return URIRef(term.value)
+    if isinstance(term, pyoxigraph.BlankNode):
+        return BNode(term.value)
+    if term.language:
+        return Literal(term.value, lang=term.language)
+    if term.datatype.value == str(XSD.string):
+        return Literal(term.value)
+    return Literal(term.value, datatype=URIRef(term.datatype.value))
+
+
+# pyoxigraph reports every simple literal as xsd:string (RDF 1.1), while rdflib
+# keeps "x" and "x"^^xsd:string apart; a datatype IRI ending in "string" means the
+# file may use the explicit form, so such files are left to rdflib's parser.
+_EXPLICIT_STRING_DATATYPE_RE = re.compile(r"\^\^\s*\S*string\b")
+
+
+def load_turtle(path: Path) -> Graph:
+    """Parse a Turtle file into an rdflib Graph, using pyoxigraph's parser when installed.
+
+    The file's prefixes are bound on the graph and relative IRIs resolve against
+    the file's own URI, as with rdflib's parser. Files with explicit
+    ^^xsd:string literals are always parsed by rdflib, so the triples are the
+    same whether or not pyoxigraph is installed.
+    """
+    g = Graph()
+    data = None if pyoxigraph is None else Path(path).read_text(encoding="utf-8")
+    if data is None or _EXPLICIT_STRING_DATATYPE_RE.search(data):
+        g.parse(str(path), format="turtle")
+        return g
+    parser = pyoxigraph.parse(
+        input=data, format=pyoxigraph.RdfFormat.TURTLE, base_iri=Path(path).absolute().as_uri()
+    )
+    g.addN(
+        (_from_oxigraph(q.subject), _from_oxigraph(q.predicate), _from_oxigraph(q.object), g)
+        for q in parser
+    )
+    for prefix, namespace in parser.prefixes.items():
+        g.bind(prefix, namespace, override=True)
+    return g
+
+
+def _has_bnode(g) -> bool:
+    return any(isinstance(s, BNode) or isinstance(o, BNode) for s, _, o in g)
+
+
+def _has_string_datatype(g) -> bool:
+    return any(isinstance(o, Literal) and o.datatype == XSD.string for _, _, o in g)
+
+
+def graphs_isomorphic(g1, g2) -> bool:
+    """Return True if both graphs (or triple sets) are equal up to blank node renaming.
+
+    Uses pyoxigraph's Rust RDF canonicalization when it is installed; rdflib's
+    pure-Python ``isomorphic`` is far slower on SoilVoc-sized graphs. Graphs with
+    ^^xsd:string literals go to rdflib, as pyoxigraph equates them with plain ones.
+    """
+    if len(g1) != len(g2):
+        return False
+    if not (_has_bnode(g1) or _has_bnode(g2)):
+        # Without blank nodes, isomorphism is plain triple-set equality.
+        return set(g1) == set(g2)
+    if pyoxigraph is None or _has_string_datatype(g1) or _has_string_datatype(g2):
+        return isomorphic(_as_graph(g1), _as_graph(g2))
+
+    def canonical(g):
+        ds = pyoxigraph.Dataset(
+            pyoxigraph.Quad(_to_oxigraph(s), _to_oxigraph(p), _to_oxigraph(o)) for s, p, o in g
+        )
+        ds.canonicalize(pyoxigraph.CanonicalizationAlgorithm.RDFC_1_0)
+        return ds
+
+    return canonical(g1) == canonical(g2)
+
+
+def build_graph_from_csv_cached(
+    csv_path: Path, scheme_uri: str, cache_dir: Path
+) -> tuple[Graph, dict[str, str]]:
+    """build_graph_from_csv, memoized on disk by the CSV bytes, scheme URI, this script
+    and the rdflib and Python versions the pickle was written with.
+
+    A cache file that cannot be unpickled is treated as a miss and rebuilt.
+    """
+    digest = hashlib.sha256()
+    digest.update(Path(__file__).read_bytes())
+    digest.update(rdflib.__version__.encode("utf-8"))
+    digest.update(repr(tuple(sys.version_info)).encode("utf-8"))
+    digest.update(scheme_uri.encode("utf-8"))
+    digest.update(csv_path.read_bytes())
+    cache_file = cache_dir / f"{digest.hexdigest()}.pickle"
+
+    if cache_file.exists():
+        try:
+            with cache_file.open("rb") as f:
+                return pickle.load(f)
+        except Exception:  # UnpicklingError, AttributeError, EOFError, ... on a stale or damaged file
+            pass
+
+    result = build_graph_from_csv(csv_path, scheme_uri)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with cache_file.open("wb") as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return result
+
+
+def _smallest_triples(triples, limit: int) -> list[tuple]:
+    """Return the first ``limit`` triples in (s, p, o) string order without sorting them all."""
+    keyed = (((str(t[0]), str(t[1]), str(t[2])), i, t) for i, t in enumerate(triples))
+    return [t for _, _, t in heapq.nsmallest(limit, keyed)]
+
+
 def diff_graphs(
-    g_expected: Graph,
-    g_actual: Graph,
+    g_expected,
+    g_actual,
     limit: int = 25,
     canonicalize_bnodes: bool = True,
 ) -> tuple[list[tuple], list[tuple]]:
+    """Return up to ``limit`` missing and extra triples; accepts Graphs or triple sets."""
     if canonicalize_bnodes:
-        iso_expected = to_isomorphic(g_expected)
-        iso_actual = to_isomorphic(g_actual)
+        iso_expected = to_isomorphic(_as_graph(g_expected))
+        iso_actual = to_isomorphic(_as_graph(g_actual))
         _, in_expected, in_actual = graph_diff(iso_expected, iso_actual)
-        missing = sorted(in_expected, key=lambda t: (str(t[0]), str(t[1]), str(t[2])))
-        extra = sorted(in_actual, key=lambda t: (str(t[0]), str(t[1]), str(t[2])))
+        missing = _smallest_triples(in_expected, limit)
+        extra = _smallest_triples(in_actual, limit)
     else:
         expected_triples = set(g_expected)
         actual_triples = set(g_actual)
-        missing = sorted(expected_triples - actual_triples, key=lambda t: (str(t[0]), str(t[1]), str(t[2])))
-        extra = sorted(actual_triples - expected_triples, key=lambda t: (str(t[0]), str(t[1]), str(t[2])))
-    return missing[:limit], extra[:limit]
+        missing = _smallest_triples(expected_triples - actual_triples, limit)
+        extra = _smallest_triples(actual_triples - expected_triples, limit)
+    return missing, extra
 
 
 def find_literal_lexical_differences(
@@ -352,11 +508,12 @@ def find_literal_lexical_differences(
 ) -> list[tuple[URIRef, URIRef, list[Literal], list[Literal]]]:
     """Return (s, p, expected_literals, actual_literals) where both graphs have literals for (s,p) but they differ."""
     def lit_map(g: Graph) -> dict[tuple[URIRef, URIRef], set[Literal]]:
+        # Scan only the requested predicates through the store's predicate index.
         out: dict[tuple[URIRef, URIRef], set[Literal]] = {}
-        for s, p, o in g:
-            if p not in predicates or not isinstance(o, Literal):
-                continue
-            out.setdefault((s, p), set()).add(o)
+        for p in predicates:
+            for s, o in g.subject_objects(p):
+                if isinstance(o, Literal):
+                    out.setdefault((s, p), set()).add(o)
         return out
 
     m_expected = lit_map(g_expected)
@@ -384,16 +541,19 @@ def find_literal_lexical_differences(
 
 def top_concepts_in_scheme(g: Graph, scheme_uri: str) -> set[URIRef]:
     scheme = URIRef(scheme_uri)
-    return set(o for _, _, o in g.triples((scheme, SKOS.hasTopConcept, None)))
+    return set(g.objects(scheme, SKOS.hasTopConcept))
 
 
-def close_topconcept_inverses(g: Graph, scheme_uri: str) -> None:
+def close_topconcept_inverses(triples: set[tuple], scheme_uri: str) -> None:
     """Ensure both skos:hasTopConcept and skos:topConceptOf are present for the given scheme."""
     scheme = URIRef(scheme_uri)
-    for tc in list(g.objects(scheme, SKOS.hasTopConcept)):
-        g.add((tc, SKOS.topConceptOf, scheme))
-    for tc in list(g.subjects(SKOS.topConceptOf, scheme)):
-        g.add((scheme, SKOS.hasTopConcept, tc))
+    inverses = set()
+    for s, p, o in triples:
+        if s == scheme and p == SKOS.hasTopConcept:
+            inverses.add((o, SKOS.topConceptOf, scheme))
+        elif p == SKOS.topConceptOf and o == scheme:
+            inverses.add((scheme, SKOS.hasTopConcept, s))
+    triples |= inverses
 
 
 def main() -> None:
@@ -408,6 +568,17 @@ def main() -> None:
         default=str(REPO_ROOT / "SoilVoc_restored.ttl"),
         help="Output TTL path",
     )
+    parser.add_argument(
+        "--format",
+        choices=("turtle", "nt"),
+        default="turtle",
+        help="Output serialization (default: turtle; nt skips the Turtle pretty-printer)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Reuse the graph built from an unchanged CSV, pickled in this directory (only use a directory you trust)",
+    )
     parser.add_argument(
         "--scheme",
         default=EUSOILVOC_SCHEME_URI,
@@ -450,9 +621,12 @@ def main() -> None:
     out_path = Path(args.out)
     compare_path = Path(args.compare)
 
-    restored, warnings = build_graph_from_csv(csv_path, args.scheme)
-    restored.serialize(destination=str(out_path), format="turtle")
-    print(f"Wrote restored TTL: {out_path}")
+    if args.cache_dir:
+        restored, warnings = build_graph_from_csv_cached(csv_path, args.scheme, Path(args.cache_dir))
+    else:
+        restored, warnings = build_graph_from_csv(csv_path, args.scheme)
+    restored.serialize(destination=str(out_path), format=args.format, encoding="utf-8")
+    print(f"Wrote restored {'TTL' if args.format == 'turtle' else 'N-Triples'}: {out_path}")
 
     if warnings.get("ambiguous_broader_labels"):
         print("\nWARNING: Ambiguous broader labels detected:")
@@ -472,8 +646,7 @@ def main() -> None:
 
     # Compare with existing TTL if present
     if compare_path.exists():
-        g_existing = Graph()
-        g_existing.parse(str(compare_path), format="turtle")
+        g_existing = load_turtle(compare_path)
 
         SEMSCIENCE_EQUIVALENT_TO = URIRef("http://semanticscience.org/resource/equivalentTo")
 
@@ -483,8 +656,8 @@ def main() -> None:
         if not args.include_equivalentto:
             ignored_predicates.add(SEMSCIENCE_EQUIVALENT_TO)
 
-        g_existing_cmp = _graph_without_predicates(g_existing, ignored_predicates)
-        restored_cmp = _graph_without_predicates(restored, ignored_predicates)
+        g_existing_cmp = _triples_without_predicates(g_existing, ignored_predicates)
+        restored_cmp = _triples_without_predicates(restored, ignored_predicates)
 
         # If requested, compare including skos:topConceptOf, but normalize both graphs so
         # they are closed under the inverse relationship hasTopConcept <-> topConceptOf.
@@ -492,13 +665,13 @@ def main() -> None:
             close_topconcept_inverses(g_existing_cmp, args.scheme)
             close_topconcept_inverses(restored_cmp, args.scheme)
 
-        same_raw = isomorphic(restored, g_existing)
-        same_cmp = isomorphic(restored_cmp, g_existing_cmp)
+        same_cmp = graphs_isomorphic(restored_cmp, g_existing_cmp)
         if ignored_predicates:
+            same_raw = graphs_isomorphic(restored, g_existing)
             print(f"\nGraph isomorphic to {compare_path} (raw): {same_raw}")
             print(f"Graph isomorphic to {compare_path} (ignoring {', '.join(sorted(str(p) for p in ignored_predicates))}): {same_cmp}")
         else:
-            print(f"\nGraph isomorphic to {compare_path}: {same_raw}")
+            print(f"\nGraph isomorphic to {compare_path}: {same_cmp}")
 
         existing_top = top_concepts_in_scheme(g_existing, args.scheme)
         restored_top = top_concepts_in_scheme(restored, args.scheme)
@@ -512,19 +685,24 @@ def main() -> None:
                 limit=25,
                 canonicalize_bnodes=not args.raw_bnode_diff,
             )
+            # Predicates and subjects repeat across diff lines; render each term once.
+            @lru_cache(maxsize=None)
+            def n3(term) -> str:
+                return term.n3(restored.namespace_manager)
+
             print(f"\nTriples missing from restored (showing up to {len(missing)}):")
             for s, p, o in missing:
-                print(f"- {s.n3(restored.namespace_manager)} {p.n3(restored.namespace_manager)} {o.n3(restored.namespace_manager)}")
+                print(f"- {n3(s)} {n3(p)} {n3(o)}")
 
             print(f"\nTriples extra in restored (showing up to {len(extra)}):")
             for s, p, o in extra:
-                print(f"- {s.n3(restored.namespace_manager)} {p.n3(restored.namespace_manager)} {o.n3(restored.namespace_manager)}")
+                print(f"- {n3(s)} {n3(p)} {n3(o)}")
 
             # Targeted literal lexical-form differences (what the user can fix in CSV)
             lit_preds = {SKOS.prefLabel, SKOS.altLabel, RDF.value, SKOS.definition}
             literal_diffs = find_literal_lexical_differences(
-                g_existing_cmp,
-                restored_cmp,
+                g_existing,
+                restored,
                 predicates=lit_preds,
                 limit=max(0, int(args.literal_diff_limit)),
             )
@@ -538,7 +716,7 @@ def main() -> None:
                         print(f"    - {lit.n3(g_existing.namespace_manager)}")
                     print("  Restored literals:")
                     for lit in actual_lits:
-                        print(f"    - {lit.n3(restored.namespace_manager)}")
+                        print(f"    - {n3(lit)}")
 
 
 if __name__ == "__main__":
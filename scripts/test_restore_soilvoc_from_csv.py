@@ -0,0 +1,41 @@
+# test_restore_soilvoc_from_csv.py
+"""
+Tests for restore_soilvoc_from_csv.py. Run with: python -m pytest scripts
+"""
+
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import XSD
+
+from restore_soilvoc_from_csv import graphs_isomorphic, load_turtle
+
+TURTLE = """\
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+@prefix ex: <http://example.org/> .
+
+ex:a ex:p "typed"^^xsd:string, "plain" .
+"""
+
+# A blank node sends graphs_isomorphic past its plain set comparison
+TURTLE_WITH_BNODE = TURTLE + 'ex:b ex:p [ ex:q "x" ] .\n'
+
+
+def test_load_turtle_keeps_xsd_string(tmp_path):
+    path = tmp_path / "strings.ttl"
+    path.write_text(TURTLE, encoding="utf-8")
+
+    g = load_turtle(path)
+
+    assert set(g) == set(Graph().parse(path, format="turtle"))
+    objects = set(g.objects(URIRef("http://example.org/a"), URIRef("http://example.org/p")))
+    assert objects == {Literal("typed", datatype=XSD.string), Literal("plain")}
+    assert dict(g.namespaces())["ex"] == URIRef("http://example.org/")
+
+
+def test_graphs_isomorphic_tells_xsd_string_from_plain(tmp_path):
+    path = tmp_path / "strings.ttl"
+    path.write_text(TURTLE_WITH_BNODE, encoding="utf-8")
+    typed = load_turtle(path)
+    plain = Graph().parse(data=TURTLE_WITH_BNODE.replace('"typed"^^xsd:string', '"typed"'), format="turtle")
+
+    assert graphs_isomorphic(typed, Graph().parse(path, format="turtle"))
+    assert not graphs_isomorphic(typed, plain)
@@ -33,7 +33,7 @@ DEFAULT_ONTOLOGY = SCRIPT_DIR / "soilvoc_ontology.ttl"
 
 def rewrite_legacy_definition_text(graph: Graph) -> int:
     changed = 0
-    for _, _, definition_node in list(graph.triples((None, SKOS.definition, None))):
+    for definition_node in list(graph.objects(None, SKOS.definition)):
         for text_value in list(graph.objects(definition_node, SCHEMA_TEXT)):
             graph.add((definition_node, RDF.value, text_value))
             graph.remove((definition_node, SCHEMA_TEXT, text_value))
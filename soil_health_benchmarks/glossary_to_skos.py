@@ -13,11 +13,24 @@ Example:
     python glossary_to_skos.py soil_glossary.csv soil_glossary.ttl
 """
 
-import pandas as pd
 import argparse
-from rdflib import Graph, URIRef, Literal, Namespace
+import csv
+from rdflib import Graph, Literal, Namespace
 from rdflib.namespace import SKOS, RDF
 
+# Cell values that pandas read as missing and that appear in exported glossaries
+_MISSING_VALUES = {'nan', 'na', 'n/a', 'null'}
+
+def _is_missing(value) -> bool:
+    """
+    Returns True if a CSV cell holds no value: None, an empty or whitespace-only
+    string, or a placeholder such as 'nan' or 'NA' (case-insensitive).
+    """
+    if value is None:
+        return True
+    text = str(value).strip()
+    return not text or text.lower() in _MISSING_VALUES
+
 def term_to_uri_fragment(term: str) -> str:
     """
     Converts a term string into a URI-friendly fragment.
@@ -28,9 +41,9 @@ def term_to_uri_fragment(term: str) -> str:
 def extract_uri_fragment_from_url(url: str) -> str:
     """
     Extracts the last path segment from a URL to use as a URI fragment.
-    Returns None if the URL is invalid.
+    Returns None if the URL is missing or empty.
     """
-    if pd.isna(url) or not url:
+    if _is_missing(url):
         return None
     # Remove trailing slash and get the last part of the path
     return url.rstrip('/').split('/')[-1]
@@ -53,9 +66,10 @@ def csv_to_skos_rdf(csv_file_path: str, output_file_path: str):
     g.bind("benchmarks", BENCHMARKS)
     g.bind("skos", SKOS)
 
-    # Read the CSV file using pandas
+    # Read the CSV file; glossaries are small, so the stdlib reader is all that is needed
     try:
-        df = pd.read_csv(csv_file_path)
+        with open(csv_file_path, newline='', encoding='utf-8-sig') as f:
+            rows = list(csv.DictReader(f))
     except FileNotFoundError:
         print(f"Error: Input file not found at '{csv_file_path}'")
         return
@@ -63,50 +77,48 @@ def csv_to_skos_rdf(csv_file_path: str, output_file_path: str):
     # --- First Pass: Map all terms to their URI fragments ---
     # This ensures that skos:related links can be created correctly even if terms
     # are defined out of order in the CSV.
-    term_to_fragment_map = {}
-    for _, row in df.iterrows():
-        term = row['term']
-        url = row.get('url') # Use .get() for safety if column is missing
-        
-        # Prefer fragment from the URL if available, otherwise generate from the term
-        fragment = extract_uri_fragment_from_url(url)
-        if not fragment:
-            fragment = term_to_uri_fragment(term)
-        
-        term_to_fragment_map[term.lower()] = fragment
+    # Prefer fragment from the URL if available, otherwise generate from the term
+    term_to_fragment_map = {
+        row['term'].lower(): extract_uri_fragment_from_url(row.get('url')) or term_to_uri_fragment(row['term'])
+        for row in rows
+    }
 
     # --- Second Pass: Build the RDF graph ---
-    for _, row in df.iterrows():
+    triples = []
+    for row in rows:
         term = row['term']
         definition = row.get('definition')
         related = row.get('related')
-        
+
         # Get the pre-determined URI fragment for the concept
         fragment = term_to_fragment_map[term.lower()]
         concept_uri = BENCHMARKS[fragment]
         
         # Add the core triples for the concept
-        g.add((concept_uri, RDF.type, SKOS.Concept))
-        g.add((concept_uri, SKOS.prefLabel, Literal(term.lower(), lang="en")))
+        triples.append((concept_uri, RDF.type, SKOS.Concept))
+        triples.append((concept_uri, SKOS.prefLabel, Literal(term.lower(), lang="en")))
         
         # Add definition(s). Handles multiple definitions separated by '|'
-        if pd.notna(definition) and definition:
+        if not _is_missing(definition):
             definitions = [d.strip() for d in str(definition).split('|') if d.strip()]
             for def_text in definitions:
-                g.add((concept_uri, SKOS.definition, Literal(def_text, lang="en")))
+                triples.append((concept_uri, SKOS.definition, Literal(def_text, lang="en")))
         
         # Add related terms. Handles multiple related terms separated by ';'
-        if pd.notna(related) and related:
+        if not _is_missing(related):
             related_terms = [t.strip() for t in str(related).split(';') if t.strip()]
             for related_term in related_terms:
                 related_term_lower = related_term.lower()
                 if related_term_lower in term_to_fragment_map:
                     related_fragment = term_to_fragment_map[related_term_lower]
                     related_uri = BENCHMARKS[related_fragment]
-                    g.add((concept_uri, SKOS.related, related_uri))
+                    triples.append((concept_uri, SKOS.related, related_uri))
                 else:
                     print(f"Warning: Related term '{related_term}' for concept '{term}' not found in glossary. Skipping.")
 
+    # Add all triples to the graph in one bulk call
+    g.addN((s, p, o, g) for s, p, o in triples)
+
     # Serialize the graph to Turtle format and save to file
     try:
         g.serialize(destination=output_file_path, format='turtle')
@@ -37,13 +37,78 @@ THESAURUS_NAMESPACES = {
     "she": Namespace("https://soilwise-he.github.io/soil-health#")
 }
 
+# All UK spellings as one case-insensitive alternation, longest first so that
+# e.g. 'colours' wins over 'colour' at the same position.
+_UK_TO_US = {uk_spelling.lower(): us_spelling for uk_spelling, us_spelling in uk_us}
+_UK_SPELLING_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(uk) for uk in sorted(_UK_TO_US, key=len, reverse=True)) + r')\b',
+    flags=re.IGNORECASE,
+)
+
 def normalize_uk_to_us(label: str) -> str:
     """Normalizes a string from British to American English spelling."""
-    for uk_spelling, us_spelling in uk_us:
-        label = re.sub(rf'\b{uk_spelling}\b', us_spelling, label, flags=re.IGNORECASE)
-    return label
+    return _UK_SPELLING_RE.sub(lambda m: _UK_TO_US[m.group(0).lower()], label)
+
+def normalized_pref_labels(graph: Graph) -> list:
+    """Returns (concept, label) pairs for every skos:prefLabel, lowercased and US-normalized."""
+    return [
+        (concept, normalize_uk_to_us(str(label).lower()))
+        for concept, label in graph.subject_objects(SKOS.prefLabel)
+    ]
+
+def thesaurus_prefix(thesaurus_csv_path: str) -> str:
+    """Derives the thesaurus prefix from the filename (e.g., "agrovoc.csv" -> "agrovoc")."""
+    base_name = os.path.basename(thesaurus_csv_path)
+    return os.path.splitext(base_name)[0].lower()
+
+def find_thesaurus_links(thesaurus_csv_path: str, local_labels: list) -> list:
+    """
+    Matches local labels against a thesaurus CSV without touching any graph.
+
+    Args:
+        thesaurus_csv_path (str): Path to the thesaurus CSV file. The CSV must contain
+                                  'concept' (URI), 'prefLabel', and 'altLabels' columns.
+        local_labels (list): Output of normalized_pref_labels() for the local vocabulary.
+
+    Returns:
+        list: (local concept, skos:exactMatch or skos:closeMatch, thesaurus concept) triples.
 
-def link_to_thesaurus(graph: Graph, thesaurus_csv_path: str):
+    Raises:
+        FileNotFoundError: If the thesaurus CSV does not exist.
+    """
+    # Load the thesaurus data
+    df = pd.read_csv(thesaurus_csv_path, encoding="utf-8")
+        
+    # Create lookup maps for prefLabels and altLabels from the thesaurus
+    # (column-wise string ops; later rows win on duplicate labels, as with a dict loop)
+    pref_label_map = {}
+    if 'prefLabel' in df:
+        pref = df.dropna(subset=['prefLabel'])
+        pref_label_map = dict(zip(pref['prefLabel'].astype(str).str.lower(), pref['concept']))
+    alt_label_map = {}
+    if 'altLabels' in df:
+        alt = df.dropna(subset=['altLabels'])
+        alt = alt.assign(altLabel=alt['altLabels'].astype(str).str.split(';')).explode('altLabel')
+        alt_labels = alt['altLabel'].str.strip().str.lower()
+        keep = (alt_labels != '').to_numpy()
+        alt_label_map = dict(zip(alt_labels[keep], alt['concept'][keep]))
+
+    # Iterate over our local concepts and create links
+    links = []
+    for local_concept, normalized_label in local_labels:
+        # Check for exact matches on preferred labels
+        if normalized_label in pref_label_map:
+            match_uri = URIRef(pref_label_map[normalized_label])
+            links.append((local_concept, SKOS.exactMatch, match_uri))
+            
+        # Check for close matches on alternative labels
+        elif normalized_label in alt_label_map:
+            match_uri = URIRef(alt_label_map[normalized_label])
+            links.append((local_concept, SKOS.closeMatch, match_uri))
+            
+    return links
+
+def link_to_thesaurus(graph: Graph, thesaurus_csv_path: str, local_labels: list | None = None):
     """
     Adds skos:exactMatch and skos:closeMatch links to the graph from a thesaurus CSV.
 
@@ -51,10 +116,10 @@ def link_to_thesaurus(graph: Graph, thesaurus_csv_path: str):
         graph (Graph): The rdflib graph to modify.
         thesaurus_csv_path (str): Path to the thesaurus CSV file. The CSV must contain
                                   'concept' (URI), 'prefLabel', and 'altLabels' columns.
+        local_labels (list): Optional output of normalized_pref_labels(graph), so the
+                             labels are normalized once when linking several thesauri.
     """
-    # Derive the thesaurus prefix from the filename (e.g., "agrovoc.csv" -> "agrovoc")
-    base_name = os.path.basename(thesaurus_csv_path)
-    prefix = os.path.splitext(base_name)[0].lower()
+    prefix = thesaurus_prefix(thesaurus_csv_path)
     
     if prefix in THESAURUS_NAMESPACES:
         print(f"\nProcessing thesaurus: {prefix}")
@@ -64,43 +129,16 @@ def link_to_thesaurus(graph: Graph, thesaurus_csv_path: str):
         print(f"Warning: Namespace for '{prefix}' is not defined. Skipping linking for this file.")
         return
 
-    # Load the thesaurus data
     try:
-        df = pd.read_csv(thesaurus_csv_path, encoding="utf-8")
+        if local_labels is None:
+            local_labels = normalized_pref_labels(graph)
+        links = find_thesaurus_links(thesaurus_csv_path, local_labels)
     except FileNotFoundError:
         print(f"Error: Thesaurus file not found at '{thesaurus_csv_path}'")
         return
-        
-    # Create lookup maps for prefLabels and altLabels from the thesaurus
-    pref_label_map = {str(row['prefLabel']).lower(): row['concept'] for _, row in df.iterrows() if pd.notna(row.get('prefLabel'))}
-    alt_label_map = {}
-    for _, row in df.iterrows():
-        if pd.notna(row.get('altLabels')):
-            alt_labels = str(row['altLabels']).split(';')
-            for alt_label in alt_labels:
-                alt_label_clean = alt_label.strip().lower()
-                if alt_label_clean:
-                    alt_label_map[alt_label_clean] = row['concept']
 
-    # Iterate over our local concepts and create links
-    concepts_linked = 0
-    for local_concept, p, local_label_literal in graph.triples((None, SKOS.prefLabel, None)):
-        local_label = str(local_label_literal).lower()
-        normalized_label = normalize_uk_to_us(local_label)
-        
-        # Check for exact matches on preferred labels
-        if normalized_label in pref_label_map:
-            match_uri = URIRef(pref_label_map[normalized_label])
-            graph.add((local_concept, SKOS.exactMatch, match_uri))
-            concepts_linked += 1
-            
-        # Check for close matches on alternative labels
-        elif normalized_label in alt_label_map:
-            match_uri = URIRef(alt_label_map[normalized_label])
-            graph.add((local_concept, SKOS.closeMatch, match_uri))
-            concepts_linked += 1
-            
-    print(f"Found and added {concepts_linked} links for {prefix}.")
+    graph.addN((s, p, o, graph) for s, p, o in links)
+    print(f"Found and added {len(links)} links for {prefix}.")
 
 
 if __name__ == "__main__":
@@ -127,11 +165,14 @@ if __name__ == "__main__":
         print(f"Error: Input file not found at '{args.input_ttl}'")
         exit()
 
+    # Normalize the local labels once; linking only adds match triples, not labels
+    local_labels = normalized_pref_labels(g)
+
     # Link against each provided thesaurus by name
     for name in args.thesauri_names:
         # Construct the full path to the CSV file from the name
         csv_path = os.path.join(THESAURUS_BASE_PATH, f"{name}.csv")
-        link_to_thesaurus(g, csv_path)
+        link_to_thesaurus(g, csv_path, local_labels)
 
     # Serialize the final, enriched graph to a new file
     try:
@@ -0,0 +1,40 @@
+# test_glossary_to_skos.py
+"""
+Tests for glossary_to_skos.py. Run with: python -m pytest soil_health_benchmarks
+"""
+
+from rdflib import Graph, URIRef
+from rdflib.namespace import SKOS
+
+from glossary_to_skos import _is_missing, csv_to_skos_rdf
+
+BENCHMARKS = "https://soilhealthbenchmarks.eu/glossary/"
+
+
+def test_is_missing():
+    for value in (None, '', '   ', 'nan', 'NaN', 'NA', 'n/a', 'NULL'):
+        assert _is_missing(value)
+    for value in ('soil', 'nano', 'Na+', '0'):
+        assert not _is_missing(value)
+
+
+def test_nan_cells_are_skipped(tmp_path, capsys):
+    csv_path = tmp_path / "glossary.csv"
+    ttl_path = tmp_path / "glossary.ttl"
+    csv_path.write_text(
+        "term,definition,url,related\n"
+        "Soil,The upper layer of the earth.,nan,Humus\n"
+        "Humus,nan,NA,nan\n",
+        encoding="utf-8",
+    )
+
+    csv_to_skos_rdf(str(csv_path), str(ttl_path))
+
+    g = Graph().parse(ttl_path, format="turtle")
+    soil = URIRef(BENCHMARKS + "soil")
+    humus = URIRef(BENCHMARKS + "humus")
+    assert (soil, SKOS.related, humus) in g
+    assert len(list(g.objects(soil, SKOS.definition))) == 1
+    assert not list(g.objects(humus, SKOS.definition))
+    assert not list(g.objects(humus, SKOS.related))
+    assert "Warning" not in capsys.readouterr().out